@@ -1,30 +1,58 @@
+import hashlib
 import streamlit as st
-from review_core import review_code_string, issues_to_markdown, filter_issues_to_changed_lines
+from review_core import (
+    review_code_string, issues_to_markdown, filter_issues_to_changed_lines,
+    get_flake8_guide, get_bandit_config,
+)
+
+# warm the analyzers before the first review; review_core keeps them for the process,
+# so on reruns these are just lookups (and after a hot reload they warm the new module)
+get_flake8_guide()
+get_bandit_config()
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _cached_review(code_digest: str, filename_hint: str, _code: str):
+    # keyed on the digest only; the leading underscore keeps Streamlit from hashing the source
+    return review_code_string(_code, filename_hint=filename_hint)
+
+def cached_review(code: str, filename_hint: str):
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+    return _cached_review(digest, filename_hint, code)
 
 st.set_page_config(page_title= "CodeAssist", layout = "wide")
 st.title("CodeAssist - Code Review")
 tab1, tab2 = st.tabs(["Review a code snippet", "Review a diff"])
 
-with tab1:
+# widget interactions inside a fragment rerun only that fragment, not the whole script
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+
+@fragment
+def snippet_tab():
     code = st.text_area("Paste Python Code", height = 240, value = "def add(a,b): return a+b/n")
     filename = st.text_input("Filename (for display)",  value = "snippet.py")
     if st.button("Review code"):
         with st.spinner("Analyzing…"):
-            issues = review_code_string(code, filename_hint=filename)  # <- get Issue list
+            issues = cached_review(code, filename)  # <- get Issue list
         st.markdown(issues_to_markdown(issues))
 
-with tab2:
-    diff_file = st.file_uploader("Upload unified diff (.patch/.diff)", type=["diff", "patch", "txt"])
+@fragment
+def diff_tab():
+    diff_file = st.file_uploader("Upload unified diff (.patch/.diff)",
+                                 type=["diff", "patch", "txt"])
     new_code = st.text_area("Paste the NEW file version referenced in the diff", height = 240)
     fname2 = st.text_input("Filename in diff", value = "src/app.py")
     
     if st.button("Review diff"):
         if diff_file and new_code:
             diff_text = diff_file.read().decode("utf-8", errors="ignore")
-            issues = review_code_string(new_code, filename_hint=fname2)  # Issue list
+            issues = cached_review(new_code, fname2)  # Issue list
             issues = filter_issues_to_changed_lines(issues, diff_text)
             st.markdown(issues_to_markdown(issues))
     else:
         st.warning("Please upload a diff and paste the new code.")
 
+with tab1:
+    snippet_tab()
 
+with tab2:
+    diff_tab()
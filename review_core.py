@@ -1,11 +1,26 @@
 # review_core.py
-import os, tempfile, subprocess, json, sys
+import ast, os, re, tempfile, threading
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Set
-from radon.complexity import cc_visit  # type: ignore
-from unidiff import PatchSet
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from typing import List, Optional, Dict, FrozenSet, Set, Tuple
+from radon.complexity import cc_visit_ast  # type: ignore
 
-@dataclass
+try:
+    from flake8.api import legacy as flake8_api
+    from flake8.formatting.base import BaseFormatter
+except ImportError:  # reported as an INSTALL issue by run_flake8
+    flake8_api = None
+
+try:
+    import bandit
+    from bandit.core import config as b_config
+    from bandit.core import manager as b_manager
+except ImportError:  # reported as an INSTALL issue by run_bandit
+    bandit = None
+
+@dataclass(slots=True, frozen=True)
 class Issue:
     file: str
     line: int                 # ✅ was str; must be int for comparisons
@@ -15,67 +30,111 @@ class Issue:
     message: str
     suggestion: Optional[str] = None
 
+# issues are frozen, so runners attach the tip for their tool when they build each Issue
+_TIPS: Dict[str, str] = {
+    "complexity": "Extract smaller functions; reduce nesting/branches.",
+    "bandit": "Avoid unsafe functions (e.g., eval); validate and sanitize inputs.",
+    "flake8": "Follow PEP 8 (naming, spacing, line length) for readability.",
+}
+
+# the temp file lives only for one review, so keep it on tmpfs when the host has one
+_TMPDIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
 def _write_temp_code(code: str, suffix: str = ".py") -> str:
-    fd, path = tempfile.mkstemp(suffix=suffix)
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=_TMPDIR)
     with os.fdopen(fd, "w", encoding="utf-8") as f:
         f.write(code)
     return path
 
-def run_flake8(code: str, filename_hint: str = "snippet.py") -> List[Issue]:
-    tmp = _write_temp_code(code)
+def _unlink_quietly(path: str) -> None:
+    try: os.unlink(path)
+    except OSError: pass
+
+if flake8_api is not None:
+    _flake8_local = threading.local()
+
+    class _CollectingFormatter(BaseFormatter):
+        """Record (row, col, code, text) for each violation instead of printing it."""
+
+        def handle(self, error) -> None:
+            _flake8_local.results.append(
+                (error.line_number, error.column_number, error.code, error.text))
+
+# guards both building the guide and running it; re-entrant so runs can fetch the guide
+_FLAKE8_LOCK = threading.RLock()
+_flake8_guide = None
+
+def get_flake8_guide():
+    # plugins are discovered on first use; every later review reuses the loaded checkers
+    global _flake8_guide
+    with _FLAKE8_LOCK:
+        if _flake8_guide is None and flake8_api is not None:
+            _flake8_guide = flake8_api.get_style_guide()
+        return _flake8_guide
+
+def _flake8_in_process(tmp: str) -> List[Tuple[int, int, str, str]]:
+    _flake8_local.results = []
+    # the guide wraps a single flake8 Application, so runs must not overlap
+    with _FLAKE8_LOCK:
+        guide = get_flake8_guide()
+        # fresh formatter/report state per run; plugins stay loaded
+        guide.init_report(_CollectingFormatter)
+        guide.check_files([tmp])
+    return _flake8_local.results
+
+def run_flake8(code: str, filename_hint: str = "snippet.py",
+               path: Optional[str] = None) -> List[Issue]:
+    tip = _TIPS["flake8"]
+    if flake8_api is None:
+        return [Issue(filename_hint, 1, "LOW", "flake8", "INSTALL",
+                      "flake8 not found. Did you install requirements?", tip)]
+    # reuse a caller-owned temp file when given; otherwise write (and clean up) our own
+    tmp = path or _write_temp_code(code)
     try:
-        fmt = "%(row)d|%(col)d|%(code)s|%(text)s"
-        cmd = [sys.executable, "-m", "flake8", "--format", fmt, tmp]
-        try:
-            out = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        except FileNotFoundError:
-            return [Issue(filename_hint, 1, "LOW", "flake8", "INSTALL",
-                          "flake8 not found. Did you install requirements?")]
-        issues: List[Issue] = []
-        for line in out.stdout.strip().splitlines():
-            try:
-                row, col, code_id, text = line.split("|", 3)
-                issues.append(Issue(filename_hint, int(row), "LOW", "flake8", code_id, text))
-            except ValueError:
-                # ignore malformed lines / plugin chatter
-                pass
-        return issues
+        return [Issue(filename_hint, row, "LOW", "flake8", code_id, text, tip)
+                for row, _col, code_id, text in _flake8_in_process(tmp)]
     finally:
-        try: os.unlink(tmp)
-        except OSError: pass
+        if path is None:
+            _unlink_quietly(tmp)
 
-def run_bandit(code: str, filename_hint: str = "snippet.py") -> List[Issue]:
-    tmp = _write_temp_code(code)
+@lru_cache(maxsize=None)
+def get_bandit_config():
+    # config is read-only once built; each review gets its own (cheap) BanditManager
+    return b_config.BanditConfig() if bandit is not None else None
+
+def _run_bandit_in_process(tmp: str, filename_hint: str) -> List[Issue]:
+    mgr = b_manager.BanditManager(get_bandit_config(), "file", quiet=True)
+    mgr.discover_files([tmp], True)
+    mgr.run_tests()
+    tip = _TIPS["bandit"]
+    return [Issue(filename_hint, int(res.lineno), (res.severity or "LOW").upper(), "bandit",
+                  res.test_id or "BXXX", res.text or "Security issue", tip)
+            for res in mgr.get_issue_list(sev_level=bandit.LOW, conf_level=bandit.LOW)]
+
+def run_bandit(code: str, filename_hint: str = "snippet.py",
+               path: Optional[str] = None) -> List[Issue]:
+    if bandit is None:
+        return [Issue(filename_hint, 1, "LOW", "bandit", "INSTALL",
+                      "bandit not found. Did you install requirements?", _TIPS["bandit"])]
+    tmp = path or _write_temp_code(code)
     try:
-        cmd = [sys.executable, "-m", "bandit", "-q", "-f", "json", tmp]
-        try:
-            out = subprocess.run(cmd, capture_output=True, text=True, check=False)
-        except FileNotFoundError:
-            return [Issue(filename_hint, 1, "LOW", "bandit", "INSTALL",
-                          "bandit not found. Did you install requirements?")]
-        issues: List[Issue] = []
-        try:
-            data = json.loads(out.stdout or "{}")
-            for res in data.get("results", []):
-                line = int(res.get("line_number", 1))
-                sev = (res.get("issue_severity") or "LOW").upper()
-                rule = res.get("test_id", "BXXX")
-                msg = res.get("issue_text", "Security issue")
-                issues.append(Issue(filename_hint, line, sev, "bandit", rule, msg))
-        except json.JSONDecodeError:
-            # ignore non-JSON output
-            pass
-        return issues
+        return _run_bandit_in_process(tmp, filename_hint)
     finally:
-        try: os.unlink(tmp)
-        except OSError: pass
+        if path is None:
+            _unlink_quietly(tmp)
 
-def run_complexity(code: str, filename_hint: str = "snippet.py", cc_threshold: int = 3) -> List[Issue]:
+def run_complexity(code: str, filename_hint: str = "snippet.py", cc_threshold: int = 3,
+                   tree: Optional[ast.AST] = None) -> List[Issue]:
+    # accept an already-parsed tree so the source is only parsed once per review
+    if tree is None:
+        tree = ast.parse(code)
+    tip = _TIPS["complexity"]
     issues: List[Issue] = []
-    for block in cc_visit(code):
+    for block in cc_visit_ast(tree):
         if block.complexity >= cc_threshold:
             msg = f"Function '{block.name}' is too complex (CC={block.complexity})."
-            issues.append(Issue(filename_hint, int(block.lineno), "MEDIUM", "complexity", "CC", msg))
+            issues.append(Issue(filename_hint, int(block.lineno), "MEDIUM", "complexity", "CC",
+                                msg, tip))
     return issues
 
 def _normalize_path(p: str) -> str:
@@ -84,46 +143,96 @@ def _normalize_path(p: str) -> str:
         p = p[2:]
     return os.path.basename(p)
 
-def _changed_lines_from_diff(diff_text: str) -> Dict[str, Set[int]]:
+# "@@ -a[,b] +c[,d] @@": b/d are the old/new line counts (1 when omitted), c the first new line
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+def _changed_lines_from_diff(diff_text: str) -> Dict[str, FrozenSet[int]]:
+    # single pass over the patch; we only need the added line numbers per target file
     changed: Dict[str, Set[int]] = {}
-    ps = PatchSet(diff_text)
-    for patched_file in ps:
-        if patched_file.is_removed_file:
-            continue
-        added: Set[int] = set()
-        for hunk in patched_file:
-            for line in hunk:
-                if line.is_added and line.target_line_no is not None:
-                    added.add(int(line.target_line_no))
-        if added:
-            changed[_normalize_path(patched_file.target_file)] = added
-    return changed
+    added: Optional[Set[int]] = None  # None while inside a deleted file
+    old_left = new_left = 0
+    target = 0
+    for line in diff_text.splitlines():
+        if old_left > 0 or new_left > 0:
+            # inside a hunk: the header's counts say where it ends, so a body line
+            # that happens to start with "+++" or "@@" is never mistaken for a header
+            tag = line[:1]
+            if tag == "+" and new_left > 0:
+                if added is not None:
+                    added.add(target)
+                target += 1
+                new_left -= 1
+                continue
+            if tag == "-" and old_left > 0:
+                old_left -= 1
+                continue
+            if tag in (" ", "") and old_left > 0 and new_left > 0:
+                target += 1
+                old_left -= 1
+                new_left -= 1
+                continue
+            if tag == "\\":  # "\ No newline at end of file"
+                continue
+            # a hunk shorter than its header claims; end it and read this line as a header
+            old_left = new_left = 0
+        if line.startswith("+++ "):
+            path = line[4:].split("\t", 1)[0]
+            added = (None if path == "/dev/null"
+                     else changed.setdefault(_normalize_path(path), set()))
+        elif line.startswith("@@"):
+            m = _HUNK_HEADER.match(line)
+            if m:
+                old_left = int(m.group(1) or 1)
+                target = int(m.group(2))
+                new_left = int(m.group(3) or 1)
+    return {path: frozenset(lines) for path, lines in changed.items() if lines}
 
 def filter_issues_to_changed_lines(issues: List[Issue], diff_text: str) -> List[Issue]:
     changed = _changed_lines_from_diff(diff_text)
     if not changed:
         return issues
-    return [
-        i for i in issues
-        if _normalize_path(i.file) in changed and i.line in changed[_normalize_path(i.file)]
-    ]
+    # issues from one review share a filename, so normalise each distinct path once
+    norm_cache: Dict[str, str] = {}
+
+    def _norm(p: str) -> str:
+        v = norm_cache.get(p)
+        if v is None:
+            v = norm_cache[p] = _normalize_path(p)
+        return v
+
+    # common case: the diff covers other files entirely, so nothing can survive the filter
+    if {_norm(i.file) for i in issues}.isdisjoint(changed):
+        return []
+
+    # look up the allowed lines once per run of same-file issues, not once per issue
+    filtered: List[Issue] = []
+    for path, group in groupby(issues, key=attrgetter("file")):
+        allowed = changed.get(_norm(path))
+        if allowed:
+            filtered.extend(i for i in group if i.line in allowed)
+    return filtered
 
 def friendly_suggestion(issue: Issue) -> Optional[str]:
-    if issue.tool == "complexity":
-        return "Extract smaller functions; reduce nesting/branches."
-    if issue.tool == "bandit":
-        return "Avoid unsafe functions (e.g., eval); validate and sanitize inputs."
-    if issue.tool == "flake8":
-        return "Follow PEP 8 (naming, spacing, line length) for readability."
-    return None
+    return _TIPS.get(issue.tool)
+
+# radon only reports functions and classes; without either keyword there is nothing to score
+_HAS_BLOCKS = re.compile(r"\b(?:def|class)\b")
 
 def review_code_string(code: str, filename_hint: str = "snippet.py", debug: bool = False) -> List[Issue]:
-    f8 = run_flake8(code, filename_hint)
-    bd = run_bandit(code, filename_hint)
-    cx = run_complexity(code, filename_hint)
+    if not code.strip():
+        return []
+    # one temp file shared by flake8 and bandit
+    tmp = _write_temp_code(code)
+    try:
+        f8 = run_flake8(code, filename_hint, tmp)
+        bd = run_bandit(code, filename_hint, tmp)
+    finally:
+        _unlink_quietly(tmp)
+    cx: List[Issue] = []
+    if _HAS_BLOCKS.search(code):
+        # radon is the only AST consumer, so only parse when it will run
+        cx = run_complexity(code, filename_hint, tree=ast.parse(code))
     issues = f8 + bd + cx
-    for i in issues:
-        i.suggestion = friendly_suggestion(i)
     if debug:
         print(f"flake8 issues: {len(f8)}; bandit: {len(bd)}; complexity: {len(cx)}")
     return issues
@@ -147,4 +256,3 @@ def issues_to_markdown(issues):
             f"at `{iss.file}:{iss.line}` — {iss.message}{tip}"
         )
     return "\n".join(lines)
-
@@ -0,0 +1,33 @@
+import review_core
+from review_core import Issue, run_bandit
+
+
+def test_issue_list_maps_to_issues():
+    issues = run_bandit('x = 1\neval("1+1")\n', filename_hint="demo.py")
+    assert issues == [
+        Issue("demo.py", 2, "MEDIUM", "bandit", "B307",
+              "Use of possibly insecure function - consider using safer ast.literal_eval.",
+              review_core._TIPS["bandit"]),
+    ]
+
+
+def test_checks_beyond_dangerous_calls_are_reported():
+    assert [(i.line, i.severity, i.rule) for i in run_bandit("assert ready\n")] == [
+        (1, "LOW", "B101"),
+    ]
+    assert [(i.line, i.rule) for i in run_bandit('password = "hunter2"\n')] == [(1, "B105")]
+
+
+def test_clean_code_has_no_issues():
+    assert run_bandit("def add(a, b):\n    return a + b\n") == []
+
+
+def test_each_run_gets_fresh_results():
+    assert [i.rule for i in run_bandit('eval("1")\n')] == ["B307"]
+    assert run_bandit("x = 1\n") == []
+
+
+def test_missing_bandit_reports_install_issue(monkeypatch):
+    monkeypatch.setattr(review_core, "bandit", None)
+    issues = run_bandit('eval("1")\n', filename_hint="demo.py")
+    assert [(i.file, i.rule, i.tool) for i in issues] == [("demo.py", "INSTALL", "bandit")]
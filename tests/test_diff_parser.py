@@ -0,0 +1,120 @@
+from review_core import Issue, _changed_lines_from_diff, filter_issues_to_changed_lines
+
+
+def test_added_lines_follow_target_numbering():
+    diff = (
+        "--- a/app.py\n"
+        "+++ b/app.py\n"
+        "@@ -1,3 +1,4 @@\n"
+        " a\n"
+        "-b\n"
+        "+B\n"
+        "+C\n"
+        " d\n"
+        "@@ -10,2 +11,3 @@\n"
+        " x\n"
+        "+y\n"
+        " z\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"app.py": {2, 3, 12}}
+
+
+def test_new_file_and_deleted_file():
+    diff = (
+        "--- a/old.py\n"
+        "+++ /dev/null\n"
+        "@@ -1,2 +0,0 @@\n"
+        "-a\n"
+        "-b\n"
+        "--- /dev/null\n"
+        "+++ b/new.py\n"
+        "@@ -0,0 +1,2 @@\n"
+        "+a\n"
+        "+b\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"new.py": {1, 2}}
+
+
+def test_omitted_counts_default_to_one():
+    diff = "--- a/x.py\n+++ b/x.py\n@@ -3 +3 @@\n-a\n+b\n"
+    assert _changed_lines_from_diff(diff) == {"x.py": {3}}
+
+
+def test_no_newline_marker_is_skipped():
+    diff = (
+        "--- a/x.py\n"
+        "+++ b/x.py\n"
+        "@@ -1,2 +1,2 @@\n"
+        " a\n"
+        "-b\n"
+        "\\ No newline at end of file\n"
+        "+c\n"
+        "\\ No newline at end of file\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"x.py": {2}}
+
+
+def test_body_lines_that_look_like_headers():
+    diff = (
+        "--- a/x.py\n"
+        "+++ b/x.py\n"
+        "@@ -1,2 +1,3 @@\n"
+        "--- a/not_a_header\n"
+        "+++ b/not_a_header\n"
+        "+@@ -1 +1 @@\n"
+        " a\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"x.py": {1, 2}}
+
+
+def test_multi_file_git_diff():
+    diff = (
+        "diff --git a/src/one.py b/src/one.py\n"
+        "index 1111111..2222222 100644\n"
+        "--- a/src/one.py\n"
+        "+++ b/src/one.py\n"
+        "@@ -1 +1,2 @@\n"
+        " a\n"
+        "+b\n"
+        "diff --git a/src/two.py b/src/two.py\n"
+        "index 3333333..4444444 100644\n"
+        "--- a/src/two.py\t2024-01-01 00:00:00\n"
+        "+++ b/src/two.py\t2024-01-02 00:00:00\n"
+        "@@ -5,0 +6 @@\n"
+        "+x\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"one.py": {2}, "two.py": {6}}
+
+
+def test_short_hunk_does_not_swallow_the_next_file():
+    diff = (
+        "diff --git a/x.py b/x.py\n"
+        "--- a/x.py\n"
+        "+++ b/x.py\n"
+        "@@ -1,1 +1,5 @@\n"
+        " a\n"
+        "+b\n"
+        "diff --git a/y.py b/y.py\n"
+        "--- a/y.py\n"
+        "+++ b/y.py\n"
+        "@@ -1 +1,2 @@\n"
+        " a\n"
+        "+c\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"x.py": {2}, "y.py": {2}}
+
+
+def test_files_sharing_a_basename_are_merged():
+    diff = (
+        "--- a/pkg/util.py\n+++ b/pkg/util.py\n@@ -0,0 +1 @@\n+a\n"
+        "--- a/lib/util.py\n+++ b/lib/util.py\n@@ -0,0 +3 @@\n+b\n"
+    )
+    assert _changed_lines_from_diff(diff) == {"util.py": {1, 3}}
+
+
+def test_filter_keeps_only_issues_on_added_lines():
+    issues = [Issue("b/app.py", n, "LOW", "flake8", "E1", "m") for n in (1, 2, 3)]
+    diff = "--- a/app.py\n+++ b/app.py\n@@ -1,2 +1,3 @@\n a\n+b\n c\n"
+    assert [i.line for i in filter_issues_to_changed_lines(issues, diff)] == [2]
+    other = diff.replace("app.py", "other.py")
+    assert filter_issues_to_changed_lines(issues, other) == []
@@ -0,0 +1,39 @@
+import review_core
+from review_core import Issue, run_flake8
+
+
+def test_violations_map_to_issues():
+    issues = run_flake8("import os\nx=1\n", filename_hint="demo.py")
+    assert [(i.line, i.rule) for i in issues] == [(1, "F401"), (2, "E225")]
+    first = issues[0]
+    assert first == Issue("demo.py", 1, "LOW", "flake8", "F401", "'os' imported but unused",
+                          review_core._TIPS["flake8"])
+
+
+def test_collecting_formatter_records_row_col_code_text(tmp_path):
+    src = tmp_path / "snippet.py"
+    src.write_text("x=1\n", encoding="utf-8")
+    assert review_core._flake8_in_process(str(src)) == [
+        (1, 2, "E225", "missing whitespace around operator"),
+    ]
+
+
+def test_repeated_runs_on_one_guide_do_not_leak_results():
+    guide = review_core.get_flake8_guide()
+    assert [i.rule for i in run_flake8("import os\n")] == ["F401"]
+    assert run_flake8("x = 1\n") == []
+    assert [i.rule for i in run_flake8("import sys\n")] == ["F401"]
+    assert review_core.get_flake8_guide() is guide
+
+
+def test_caller_owned_path_is_left_in_place(tmp_path):
+    src = tmp_path / "snippet.py"
+    src.write_text("import os\n", encoding="utf-8")
+    assert [i.rule for i in run_flake8("", path=str(src))] == ["F401"]
+    assert src.exists()
+
+
+def test_missing_flake8_reports_install_issue(monkeypatch):
+    monkeypatch.setattr(review_core, "flake8_api", None)
+    issues = run_flake8("import os\n", filename_hint="demo.py")
+    assert [(i.file, i.rule, i.tool) for i in issues] == [("demo.py", "INSTALL", "flake8")]
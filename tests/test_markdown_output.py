@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from review_core import Issue, issues_to_markdown
+
+
+def test_empty_list_reports_no_issues():
+    assert issues_to_markdown([]) == "✅ No issues found. Great job!"
+
+
+def test_string_is_passed_through():
+    assert issues_to_markdown("already rendered") == "already rendered"
+
+
+def test_issue_lines_format():
+    issues = [
+        Issue("app.py", 3, "LOW", "flake8", "E231", "missing whitespace after ','",
+              "Follow PEP 8."),
+        Issue("app.py", 7, "MEDIUM", "bandit", "B307", "Use of eval."),
+    ]
+    assert issues_to_markdown(issues) == (
+        "### Review Comments\n"
+        "- **FLAKE8 E231** (LOW) at `app.py:3` — missing whitespace after ',' Tip: Follow PEP 8.\n"
+        "- **BANDIT B307** (MEDIUM) at `app.py:7` — Use of eval."
+    )
+
+
+def test_non_issue_items_are_skipped():
+    issues = ["junk", Issue("a.py", 1, "LOW", "flake8", "F401", "unused")]
+    assert issues_to_markdown(issues) == (
+        "### Review Comments\n- **FLAKE8 F401** (LOW) at `a.py:1` — unused"
+    )
+
+
+def test_duck_typed_fields_are_stringified():
+    iss = SimpleNamespace(tool="custom", rule=None, severity="LOW", file="a.py", line=2,
+                          message="msg", suggestion=None)
+    assert issues_to_markdown([iss]) == (
+        "### Review Comments\n- **CUSTOM None** (LOW) at `a.py:2` — msg"
+    )